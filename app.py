@@ -1,10 +1,21 @@
 """FastAPI application for Lyric Transcribe."""
 
 import asyncio
+import contextlib
+import functools
+import heapq
+import itertools
 import json
+import os
+from collections import deque
 from pathlib import Path
 
-from fastapi import FastAPI, HTTPException
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
@@ -26,11 +37,136 @@ app = FastAPI(title="Lyric Transcribe")
 CONFIG_PATH = Path(__file__).parent / "config.json"
 
 # Supported audio extensions
-AUDIO_EXTENSIONS = {".m4a", ".mp3", ".mp4", ".wav", ".flac", ".ogg", ".aac"}
+AUDIO_EXTENSIONS = frozenset({".m4a", ".mp3", ".mp4", ".wav", ".flac", ".ogg", ".aac"})
+
+# Precompiled suffix tuple so the scan loop can use one str.endswith call
+# for the common all-lower/all-upper spellings; mixed case falls back to
+# the .lower() membership check
+_AUDIO_SUFFIXES = tuple(AUDIO_EXTENSIONS) + tuple(ext.upper() for ext in AUDIO_EXTENSIONS)
+
+
+def _json_dumps(data) -> str:
+    """Serialize to a JSON string, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(data).decode()
+    return json.dumps(data)
+
 
 # Audio merger instance
 audio_merger = AudioMerger()
-merge_progress_queue = None
+
+
+class MergeBroker:
+    """Fan merge events out to all SSE subscribers.
+
+    Mirrors the subscribe/unsubscribe pattern in TaskManager so multiple
+    browsers can follow the same merge without racing over one queue.
+    Published events get a monotonically increasing id and are kept in a
+    small ring buffer so a reconnecting client can replay what it missed
+    via the SSE Last-Event-ID header.
+    """
+
+    def __init__(self):
+        self._subscribers: list[asyncio.Queue] = []
+        self._buffer: deque[dict] = deque(maxlen=256)
+        self._next_id = 0
+
+    def subscribe(self) -> asyncio.Queue:
+        """Subscribe to merge events."""
+        queue = asyncio.Queue(maxsize=2000)
+        self._subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        """Unsubscribe from merge events."""
+        if queue in self._subscribers:
+            self._subscribers.remove(queue)
+
+    def replay_since(self, last_id: int) -> list[dict]:
+        """Return buffered events newer than last_id, oldest first."""
+        return [event for event in self._buffer if event["id"] > last_id]
+
+    def publish(self, event: dict):
+        """Publish an event to all subscribers."""
+        event = {"id": self._next_id, **event}
+        self._next_id += 1
+        # Serialize the SSE frame once; every subscriber (and any later
+        # replay) shares the string instead of re-encoding the payload
+        event["_frame"] = (
+            f"id: {event['id']}\nevent: {event['type']}\ndata: {_json_dumps(event['data'])}\n\n"
+        )
+        self._buffer.append(event)
+
+        dead_queues = []
+        for queue in self._subscribers:
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                dead_queues.append(queue)
+
+        for queue in dead_queues:
+            self._subscribers.remove(queue)
+
+
+merge_broker = MergeBroker()
+
+# Progress-style events where only the latest value matters to a client
+_COALESCE_EVENT_TYPES = {"progress", "merge_progress"}
+
+
+async def _buffered(source, maxsize: int = 4):
+    """Prefetch frames from an async generator into a small queue.
+
+    Lets frame production (queue drain + JSON encode) for event N+1 run
+    while frame N is still being written to a slow client.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+    done = object()
+
+    async def pump():
+        try:
+            async for item in source:
+                await queue.put(item)
+            await queue.put(done)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Wake the consumer; awaiting the task re-raises the error
+            await queue.put(done)
+            raise
+
+    task = asyncio.create_task(pump())
+    try:
+        while True:
+            item = await queue.get()
+            if item is done:
+                await task  # propagate any error from the source
+                break
+            yield item
+    finally:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+
+async def _next_events(queue: asyncio.Queue) -> list[dict]:
+    """Wait for one event, then drain the queue, dropping stale progress.
+
+    Consecutive progress events of the same type collapse to the newest
+    one; all other events are kept in order. Only the first get() awaits,
+    so a timeout cancellation can never lose a consumed event.
+    """
+    events = [await queue.get()]
+    while True:
+        try:
+            event = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return events
+
+        if event["type"] in _COALESCE_EVENT_TYPES and events[-1]["type"] == event["type"]:
+            events[-1] = event
+        else:
+            events.append(event)
 
 
 # Merge request model
@@ -42,22 +178,52 @@ class MergeRequest(BaseModel):
     overwrite: bool = False
 
 
-def load_config() -> Config:
-    """Load configuration from file."""
-    if CONFIG_PATH.exists():
-        try:
-            with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                return Config(**data)
-        except Exception:
-            pass
-    return Config()
+# Cached (st_mtime_ns, Config) pair so repeated load_config() calls on the
+# API hot path don't re-read and re-parse an unchanged config.json
+_config_cache: tuple[int, Config] | None = None
+
+
+def _load_config_sync() -> Config:
+    """Blocking config read; run via asyncio.to_thread."""
+    global _config_cache
+
+    try:
+        mtime_ns = CONFIG_PATH.stat().st_mtime_ns
+    except FileNotFoundError:
+        return Config()
 
+    if _config_cache is not None and _config_cache[0] == mtime_ns:
+        return _config_cache[1]
 
-def save_config(config: Config):
+    try:
+        # pydantic-core parses the raw bytes directly, skipping the
+        # intermediate Python dict
+        config = Config.model_validate_json(CONFIG_PATH.read_bytes())
+    except Exception:
+        return Config()
+
+    _config_cache = (mtime_ns, config)
+    return config
+
+
+def _save_config_sync(config: Config):
+    """Blocking config write; run via asyncio.to_thread."""
+    global _config_cache
+
+    CONFIG_PATH.write_text(config.model_dump_json(indent=2), encoding="utf-8")
+
+    # Refresh the cache so the next load_config() hits it immediately
+    _config_cache = (CONFIG_PATH.stat().st_mtime_ns, config)
+
+
+async def load_config() -> Config:
+    """Load configuration from file (cached until config.json changes)."""
+    return await asyncio.to_thread(_load_config_sync)
+
+
+async def save_config(config: Config):
     """Save configuration to file."""
-    with open(CONFIG_PATH, "w", encoding="utf-8") as f:
-        json.dump(config.model_dump(), f, indent=2, ensure_ascii=False)
+    await asyncio.to_thread(_save_config_sync, config)
 
 
 # Mount static files
@@ -74,20 +240,26 @@ async def root():
 @app.get("/api/config")
 async def get_config() -> Config:
     """Get current configuration."""
-    return load_config()
+    return await load_config()
 
 
 @app.post("/api/config")
 async def update_config(config: Config) -> Config:
     """Update and persist configuration."""
-    save_config(config)
+    await save_config(config)
     return config
 
 
+@functools.lru_cache(maxsize=1)
+def _cached_models() -> list[str]:
+    """Cache the model list; it doesn't change during a server run."""
+    return get_available_models()
+
+
 @app.get("/api/models")
 async def get_models() -> list[str]:
     """Get available whisper models."""
-    return get_available_models()
+    return _cached_models()
 
 
 @app.get("/api/paths/search")
@@ -102,12 +274,39 @@ async def search_paths(prefix: str = "", path_type: str = "directory") -> list[s
     Returns:
         List of matching absolute paths (max 20 results)
     """
-    import os
-    from pathlib import Path
-    
+    return await asyncio.to_thread(_search_paths_sync, prefix, path_type)
+
+
+def _scan_matching_paths(dir_path: Path, name_prefix: str, path_type: str, max_results: int) -> list[str]:
+    """Collect up to max_results matching paths without sorting the whole directory.
+
+    Stops scanning after a few times the limit so huge directories are
+    never fully materialized; heapq.nsmallest keeps the result in name
+    order without an O(N log N) sort.
+    """
+    matches = []
+    with os.scandir(dir_path) as it:
+        for entry in it:
+            if name_prefix and not entry.name.startswith(name_prefix):
+                continue
+            try:
+                if path_type == "directory" and not entry.is_dir():
+                    continue
+                if path_type == "file" and not entry.is_file():
+                    continue
+            except OSError:
+                continue
+            matches.append(entry.path)
+            if len(matches) >= max_results * 4:
+                break
+    return heapq.nsmallest(max_results, matches)
+
+
+def _search_paths_sync(prefix: str, path_type: str) -> list[str]:
+    """Blocking path search; run via asyncio.to_thread."""
     results = []
     max_results = 20
-    
+
     # Handle empty prefix - return common directories
     if not prefix or prefix == "/":
         common_dirs = [
@@ -121,119 +320,137 @@ async def search_paths(prefix: str = "", path_type: str = "directory") -> list[s
         ]
         results = [str(d) for d in common_dirs if d.exists() and d.is_dir()]
         return results[:max_results]
-    
+
     try:
         prefix_path = Path(prefix).expanduser()
-        
+
         # If the prefix is an exact directory, return its contents
         if prefix_path.exists() and prefix_path.is_dir():
             try:
-                for item in sorted(prefix_path.iterdir()):
-                    if path_type == "directory" and not item.is_dir():
-                        continue
-                    if path_type == "file" and not item.is_file():
-                        continue
-                    results.append(str(item))
-                    if len(results) >= max_results:
-                        break
+                results = _scan_matching_paths(prefix_path, "", path_type, max_results)
             except PermissionError:
                 pass
         else:
             # Search for directories matching the prefix
             parent = prefix_path.parent
             name_prefix = prefix_path.name
-            
+
             if parent.exists() and parent.is_dir():
                 try:
-                    for item in sorted(parent.iterdir()):
-                        if not item.name.startswith(name_prefix):
-                            continue
-                        if path_type == "directory" and not item.is_dir():
-                            continue
-                        if path_type == "file" and not item.is_file():
-                            continue
-                        results.append(str(item))
-                        if len(results) >= max_results:
-                            break
+                    results = _scan_matching_paths(parent, name_prefix, path_type, max_results)
                 except PermissionError:
                     pass
     except Exception:
         # Return empty list on any error
         pass
-    
+
     return results
 
 
 @app.get("/api/files")
 async def get_files() -> list[FileInfo]:
     """Get list of files to process."""
-    config = load_config()
+    config = await load_config()
 
     if not config.source_dir:
         return []
 
     source_dir = Path(config.source_dir)
-    if not source_dir.exists():
-        return []
-
     lyric_dir = Path(config.lyric_dir) if config.lyric_dir else None
     output_dir = Path(config.output_dir) if config.output_dir else None
 
-    files = []
-    for file_path in sorted(source_dir.iterdir()):
-        if file_path.suffix.lower() not in AUDIO_EXTENSIONS:
-            continue
+    # One thread hop pays for the whole scan (N stat/exists syscalls)
+    return await asyncio.to_thread(_scan_files, source_dir, lyric_dir, output_dir)
+
+
+def _scan_files(source_dir: Path, lyric_dir: Path | None, output_dir: Path | None) -> list[FileInfo]:
+    """Blocking source-directory scan; run via asyncio.to_thread."""
+    return list(_iter_file_infos(source_dir, lyric_dir, output_dir))
 
-        stem = file_path.stem
 
-        # Check if LRC exists
-        has_lyric = False
-        if lyric_dir:
-            lrc_path = lyric_dir / f"{stem}.lrc"
-            has_lyric = lrc_path.exists()
+def _iter_file_infos(source_dir: Path, lyric_dir: Path | None, output_dir: Path | None):
+    """Yield FileInfo for each audio file in source_dir, in name order."""
+    try:
+        with os.scandir(source_dir) as it:
+            entries = sorted(it, key=lambda e: e.name)
+    except OSError:
+        return
+
+    # One listing per directory instead of two exists() syscalls per file
+    try:
+        lyric_names = set(os.listdir(lyric_dir)) if lyric_dir else set()
+    except OSError:
+        lyric_names = set()
+    try:
+        output_names = set(os.listdir(output_dir)) if output_dir else set()
+    except OSError:
+        output_names = set()
+
+    for entry in entries:
+        name = entry.name
+        dot = name.rfind(".")
+        if dot <= 0:
+            continue
+        if not name.endswith(_AUDIO_SUFFIXES) and name[dot:].lower() not in AUDIO_EXTENSIONS:
+            continue
 
-        # Check if output MP3 exists
-        has_output = False
-        if output_dir:
-            output_path = output_dir / f"{stem}.mp3"
-            has_output = output_path.exists()
+        stem = name[:dot]
 
-        # Get file size
+        has_lyric = f"{stem}.lrc" in lyric_names
+        has_output = f"{stem}.mp3" in output_names
+
+        # DirEntry.stat() reuses data already fetched by scandir where possible
         try:
-            size_bytes = file_path.stat().st_size
-        except Exception:
+            size_bytes = entry.stat().st_size
+        except OSError:
             size_bytes = 0
 
-        files.append(FileInfo(
-            name=file_path.name,
+        yield FileInfo(
+            name=name,
             has_lyric=has_lyric,
             has_output=has_output,
             status=FileStatus.COMPLETED if (has_lyric and has_output) else FileStatus.PENDING,
             size_bytes=size_bytes,
-        ))
+        )
 
-    return files
 
+@app.get("/api/files/stream")
+async def get_files_stream():
+    """Stream the file listing as NDJSON, one FileInfo per line.
 
-@app.post("/api/task/start")
-async def start_task(request: TaskStartRequest) -> dict:
-    """Start processing task."""
-    config = load_config()
+    For large libraries this starts responding after the first batch
+    instead of waiting for the whole scan.
+    """
+    config = await load_config()
+
+    async def generate():
+        if not config.source_dir:
+            return
+
+        source_dir = Path(config.source_dir)
+        lyric_dir = Path(config.lyric_dir) if config.lyric_dir else None
+        output_dir = Path(config.output_dir) if config.output_dir else None
+
+        file_iter = _iter_file_infos(source_dir, lyric_dir, output_dir)
+        while True:
+            # Batch the blocking scan so each thread hop covers 128 files
+            batch = await asyncio.to_thread(lambda: list(itertools.islice(file_iter, 128)))
+            if not batch:
+                break
+            for info in batch:
+                yield _json_dumps(info.model_dump()) + "\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
 
-    if not config.source_dir:
-        raise HTTPException(status_code=400, detail="Source directory not configured")
-    if not config.lyric_dir:
-        raise HTTPException(status_code=400, detail="Lyric directory not configured")
-    if not config.output_dir:
-        raise HTTPException(status_code=400, detail="Output directory not configured")
 
+def _build_file_tasks(filenames: list[str], config: Config) -> list[FileTask]:
+    """Blocking existence checks for requested files; run via asyncio.to_thread."""
     source_dir = Path(config.source_dir)
     lyric_dir = Path(config.lyric_dir)
     output_dir = Path(config.output_dir)
 
-    # Build file tasks
     file_tasks = []
-    for filename in request.files:
+    for filename in filenames:
         source_path = source_dir / filename
         if not source_path.exists():
             continue
@@ -246,6 +463,23 @@ async def start_task(request: TaskStartRequest) -> dict:
             output_path=str(output_dir / f"{stem}.mp3"),
         ))
 
+    return file_tasks
+
+
+@app.post("/api/task/start")
+async def start_task(request: TaskStartRequest) -> dict:
+    """Start processing task."""
+    config = await load_config()
+
+    if not config.source_dir:
+        raise HTTPException(status_code=400, detail="Source directory not configured")
+    if not config.lyric_dir:
+        raise HTTPException(status_code=400, detail="Lyric directory not configured")
+    if not config.output_dir:
+        raise HTTPException(status_code=400, detail="Output directory not configured")
+
+    file_tasks = await asyncio.to_thread(_build_file_tasks, request.files, config)
+
     if not file_tasks:
         raise HTTPException(status_code=400, detail="No valid files to process")
 
@@ -257,9 +491,13 @@ async def start_task(request: TaskStartRequest) -> dict:
 
 
 @app.get("/api/task/status")
-async def get_task_status() -> TaskStatus:
-    """Get current task status."""
-    return task_manager.get_status()
+async def get_task_status(since: float = 0) -> TaskStatus:
+    """Get current task status.
+
+    Pass ?since=<timestamp> (the last-seen event timestamp) to receive
+    only newer events in recent_output.
+    """
+    return task_manager.get_status(since)
 
 
 @app.post("/api/task/cancel")
@@ -277,20 +515,27 @@ async def task_stream():
         try:
             while True:
                 try:
-                    event = await asyncio.wait_for(queue.get(), timeout=30.0)
-                    yield f"event: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
-
-                    # Stop streaming if task is complete
-                    if event['type'] in ['task_complete', 'task_cancelled']:
-                        break
+                    events = await asyncio.wait_for(_next_events(queue), timeout=30.0)
                 except asyncio.TimeoutError:
                     # Send keepalive
                     yield ": keepalive\n\n"
+                    continue
+
+                for event in events:
+                    # broadcast() pre-serializes the frame once per event
+                    frame = event.get('_frame')
+                    if frame is None:
+                        frame = f"event: {event['type']}\ndata: {_json_dumps(event['data'])}\n\n"
+                    yield frame
+
+                # Stop streaming if task is complete
+                if any(e['type'] in ['task_complete', 'task_cancelled'] for e in events):
+                    break
         finally:
             task_manager.unsubscribe(queue)
 
     return StreamingResponse(
-        event_generator(),
+        _buffered(event_generator()),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -303,19 +548,19 @@ async def task_stream():
 @app.get("/api/audio/check-exists")
 async def check_file_exists(filename: str) -> dict:
     """Check if a file exists in the merge output directory."""
-    config = load_config()
-    
+    config = await load_config()
+
     if not config.merge_output_dir:
         return {"exists": False}
-    
+
     output_path = Path(config.merge_output_dir) / filename
-    return {"exists": output_path.exists()}
+    return {"exists": await asyncio.to_thread(output_path.exists)}
 
 
 @app.post("/api/audio/merge")
 async def merge_audio(request: MergeRequest) -> dict:
     """Start audio merge task."""
-    config = load_config()
+    config = await load_config()
 
     if not config.merge_source_dir:
         raise HTTPException(status_code=400, detail="Merge source directory not configured")
@@ -326,13 +571,13 @@ async def merge_audio(request: MergeRequest) -> dict:
     output_dir = Path(config.merge_output_dir)
 
     # Ensure output directory exists
-    output_dir.mkdir(parents=True, exist_ok=True)
+    await asyncio.to_thread(output_dir.mkdir, parents=True, exist_ok=True)
 
     # Build source file paths
     source_files = []
     for filename in request.files:
         source_path = source_dir / filename
-        if not source_path.exists():
+        if not await asyncio.to_thread(source_path.exists):
             raise HTTPException(status_code=404, detail=f"File not found: {filename}")
         source_files.append(source_path)
 
@@ -347,34 +592,33 @@ async def merge_audio(request: MergeRequest) -> dict:
     output_path = output_dir / output_name
 
     # Check if file exists and not overwrite
-    if output_path.exists() and not request.overwrite:
+    if await asyncio.to_thread(output_path.exists) and not request.overwrite:
         raise HTTPException(status_code=409, detail=f"File already exists: {output_name}")
 
     # Start merge in background
-    global merge_progress_queue
-    merge_progress_queue = asyncio.Queue()
+    loop = asyncio.get_running_loop()
+
+    def on_merge_progress(progress_data: dict):
+        """Sync progress callback; safe to call from any thread."""
+        loop.call_soon_threadsafe(merge_broker.publish, {
+            'type': 'merge_progress',
+            'data': progress_data
+        })
 
     async def run_merge():
         """Run merge operation."""
         try:
             # Send start event
-            await merge_progress_queue.put({
+            merge_broker.publish({
                 'type': 'merge_start',
                 'data': {'file_count': len(source_files)}
             })
 
-            # Progress callback
-            async def progress_callback(progress_data):
-                await merge_progress_queue.put({
-                    'type': 'merge_progress',
-                    'data': progress_data
-                })
-
             # Run merge
             success = await audio_merger.merge_audio_files(
                 source_files,
                 output_path,
-                progress_callback=lambda data: asyncio.create_task(progress_callback(data))
+                progress_callback=on_merge_progress,
             )
 
             if success:
@@ -382,18 +626,18 @@ async def merge_audio(request: MergeRequest) -> dict:
                 if request.delete_sources:
                     await audio_merger.delete_source_files(source_files)
 
-                await merge_progress_queue.put({
+                merge_broker.publish({
                     'type': 'merge_complete',
                     'data': {'output_file': output_name}
                 })
             else:
-                await merge_progress_queue.put({
+                merge_broker.publish({
                     'type': 'merge_error',
                     'data': {'message': 'Merge failed'}
                 })
 
         except Exception as e:
-            await merge_progress_queue.put({
+            merge_broker.publish({
                 'type': 'merge_error',
                 'data': {'message': str(e)}
             })
@@ -404,32 +648,64 @@ async def merge_audio(request: MergeRequest) -> dict:
     return {"success": True, "message": "Merge started"}
 
 
+@app.post("/api/audio/merge/cancel")
+async def cancel_merge() -> dict:
+    """Cancel the current merge operation."""
+    await audio_merger.cancel()
+    return {"success": True}
+
+
 @app.get("/api/audio/merge/stream")
-async def merge_stream():
+async def merge_stream(request: Request):
     """SSE endpoint for merge progress."""
+    def format_frame(event: dict) -> str:
+        # The id: field makes the browser send Last-Event-ID on reconnect;
+        # the frame itself was pre-serialized once at publish time
+        return event["_frame"]
+
     async def event_generator():
-        global merge_progress_queue
-        
-        if merge_progress_queue is None:
-            merge_progress_queue = asyncio.Queue()
-        
+        queue = merge_broker.subscribe()
+        last_sent_id = -1
         try:
-            while True:
+            # Replay events the client missed while disconnected
+            last_event_id = request.headers.get("last-event-id")
+            if last_event_id is not None:
                 try:
-                    event = await asyncio.wait_for(merge_progress_queue.get(), timeout=30.0)
-                    yield f"event: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
+                    last_sent_id = int(last_event_id)
+                    missed = merge_broker.replay_since(last_sent_id)
+                except ValueError:
+                    missed = []
+
+                for event in missed:
+                    yield format_frame(event)
+                    last_sent_id = event['id']
 
-                    # Stop streaming if merge is complete
-                    if event['type'] in ['merge_complete', 'merge_error']:
-                        break
+                if any(e['type'] in ['merge_complete', 'merge_error'] for e in missed):
+                    return
+
+            while True:
+                try:
+                    events = await asyncio.wait_for(_next_events(queue), timeout=30.0)
                 except asyncio.TimeoutError:
                     # Send keepalive
                     yield ": keepalive\n\n"
-        except Exception as e:
-            print(f"Stream error: {e}")
+                    continue
+
+                for event in events:
+                    # Skip anything already delivered during replay
+                    if event['id'] <= last_sent_id:
+                        continue
+                    yield format_frame(event)
+                    last_sent_id = event['id']
+
+                # Stop streaming if merge is complete
+                if any(e['type'] in ['merge_complete', 'merge_error'] for e in events):
+                    break
+        finally:
+            merge_broker.unsubscribe(queue)
 
     return StreamingResponse(
-        event_generator(),
+        _buffered(event_generator()),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -440,5 +716,10 @@ async def merge_stream():
 
 
 if __name__ == "__main__":
+    import sys
+
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+
+    # uvloop is unavailable on Windows; fall back to the default loop
+    loop = "asyncio" if sys.platform == "win32" else "uvloop"
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop=loop)
@@ -3,8 +3,8 @@
 import asyncio
 import logging
 import os
+import signal
 import subprocess
-import tempfile
 from pathlib import Path
 from typing import Callable, List, Optional
 
@@ -15,9 +15,49 @@ class AudioMerger:
     """Handle audio file merging using FFmpeg."""
 
     def __init__(self):
-        self.process: Optional[subprocess.Popen] = None
+        self.process: Optional[asyncio.subprocess.Process] = None
         self.cancelled = False
 
+    @staticmethod
+    async def _probe_duration(path: Path) -> float:
+        """Get audio duration in seconds using ffprobe (0.0 on failure)."""
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                'ffprobe',
+                '-v', 'error',
+                '-show_entries', 'format=duration',
+                '-of', 'default=nw=1:nk=1',
+                str(path),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            stdout, _ = await proc.communicate()
+            return float(stdout.strip())
+        except (OSError, ValueError):
+            return 0.0
+
+    @staticmethod
+    async def _probe_stream_params(path: Path) -> Optional[tuple]:
+        """Return (codec_name, sample_rate, channels) for the first audio stream."""
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                'ffprobe',
+                '-v', 'error',
+                '-select_streams', 'a:0',
+                '-show_entries', 'stream=codec_name,sample_rate,channels',
+                '-of', 'csv=p=0',
+                str(path),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            stdout, _ = await proc.communicate()
+            parts = stdout.decode().strip().split(',')
+            if len(parts) >= 3:
+                return (parts[0], parts[1], parts[2])
+        except OSError:
+            pass
+        return None
+
     async def merge_audio_files(
         self,
         source_files: List[Path],
@@ -35,6 +75,10 @@ class AudioMerger:
         Returns:
             True if successful, False otherwise
         """
+        # Reset any flag left over from a previous cancel so one
+        # cancelled (or spurious) cancel doesn't abort every later merge
+        self.cancelled = False
+
         if not source_files:
             logger.error("No source files provided")
             return False
@@ -48,15 +92,14 @@ class AudioMerger:
             output_path = output_path.with_suffix('.wav')
 
         try:
-            # Create temporary file list for FFmpeg
-            with tempfile.NamedTemporaryFile(
-                mode='w', suffix='.txt', delete=False, encoding='utf-8'
-            ) as temp_file:
-                filelist_path = temp_file.name
-                for source_file in source_files:
-                    # Escape single quotes in filenames
-                    escaped_path = str(source_file).replace("'", "'\\''")
-                    temp_file.write(f"file '{escaped_path}'\n")
+            # Build the concat list in memory; it's fed to ffmpeg over
+            # stdin so nothing touches the filesystem
+            filelist_lines = []
+            for source_file in source_files:
+                # Escape single quotes in filenames
+                escaped_path = str(source_file).replace("'", "'\\''")
+                filelist_lines.append(f"file '{escaped_path}'\n")
+            filelist_data = ''.join(filelist_lines).encode('utf-8')
 
             logger.info(f"Merging {len(source_files)} files into {output_path}")
 
@@ -66,15 +109,39 @@ class AudioMerger:
                     'message': f'正在准备合并 {len(source_files)} 个文件...'
                 })
 
+            # Total input duration drives the real progress percentage
+            total_duration = 0.0
+            for source_file in source_files:
+                total_duration += await self._probe_duration(source_file)
+
+            # Stream-copy when every source already matches the target
+            # format — skips the decode/resample/encode pass entirely
+            stream_params = [await self._probe_stream_params(f) for f in source_files]
+            can_copy = (
+                all(p is not None and p[0] == 'pcm_s16le' and p[1] == '44100' for p in stream_params)
+                and len(set(stream_params)) == 1
+            )
+            if can_copy:
+                codec_args = ['-c:a', 'copy']
+                logger.info("All sources are pcm_s16le @ 44100Hz; using stream copy")
+            else:
+                codec_args = [
+                    '-c:a', 'pcm_s16le',  # WAV format, 16-bit PCM
+                    '-ar', '44100',       # 44.1kHz sample rate
+                ]
+                logger.info("Source formats differ; re-encoding to pcm_s16le @ 44100Hz")
+
             # Build FFmpeg command
             # Using concat demuxer for better compatibility
             cmd = [
                 'ffmpeg',
                 '-f', 'concat',
                 '-safe', '0',
-                '-i', filelist_path,
-                '-c:a', 'pcm_s16le',  # WAV format, 16-bit PCM
-                '-ar', '44100',       # 44.1kHz sample rate
+                '-protocol_whitelist', 'file,pipe',
+                '-i', 'pipe:0',
+                *codec_args,
+                '-progress', 'pipe:1',  # Machine-readable progress on stdout
+                '-nostats',
                 '-y',                 # Overwrite output file
                 str(output_path)
             ]
@@ -87,51 +154,60 @@ class AudioMerger:
                     'message': '正在启动 FFmpeg...'
                 })
 
-            # Run FFmpeg
-            self.process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                universal_newlines=True
+            # Run FFmpeg without blocking the event loop, in its own
+            # process group so cancel can kill the whole tree
+            self.process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                start_new_session=True,
             )
 
+            # Hand over the concat list and signal EOF
+            self.process.stdin.write(filelist_data)
+            await self.process.stdin.drain()
+            self.process.stdin.close()
+
             if progress_callback:
                 progress_callback({
                     'percentage': 30,
                     'message': '正在合并音频文件...'
                 })
 
-            # Read output
-            stderr_output = []
-            line_count = 0
-            if self.process.stderr:
-                for line in self.process.stderr:
+            # Collect stderr in the background so the pipe can't fill up
+            stderr_task = asyncio.create_task(self.process.stderr.read())
+
+            # Parse the key=value progress stream on stdout
+            last_pct = -1
+            if self.process.stdout:
+                async for raw_line in self.process.stdout:
                     if self.cancelled:
                         self.process.terminate()
                         logger.info("Merge cancelled by user")
                         return False
 
-                    stderr_output.append(line)
-                    logger.debug(f"FFmpeg: {line.strip()}")
-                    line_count += 1
+                    line = raw_line.decode('utf-8', errors='replace').strip()
+                    if not line.startswith('out_time_us=') or total_duration <= 0:
+                        continue
 
-                    # Send progress updates periodically
-                    if line_count % 5 == 0 and progress_callback:
-                        # Gradually increase progress from 30% to 90%
-                        progress_pct = min(90, 30 + (line_count * 2))
+                    try:
+                        out_time_us = int(line.split('=', 1)[1])
+                    except ValueError:
+                        continue
+
+                    # Map real completion onto the 30-90% band
+                    pct = min(90, 30 + int(60 * (out_time_us / 1_000_000) / total_duration))
+                    if pct != last_pct and progress_callback:
+                        last_pct = pct
                         progress_callback({
-                            'percentage': progress_pct,
+                            'percentage': pct,
                             'message': '正在合并音频文件...'
                         })
 
             # Wait for completion
-            returncode = self.process.wait()
-
-            # Clean up temporary file
-            try:
-                os.unlink(filelist_path)
-            except Exception as e:
-                logger.warning(f"Failed to delete temp file: {e}")
+            returncode = await self.process.wait()
+            stderr_output = (await stderr_task).decode('utf-8', errors='replace').splitlines()
 
             if returncode != 0:
                 error_msg = '\n'.join(stderr_output[-10:])  # Last 10 lines
@@ -153,15 +229,32 @@ class AudioMerger:
         finally:
             self.process = None
 
-    def cancel(self):
-        """Cancel the current merge operation."""
+    async def cancel(self):
+        """Cancel the current merge operation.
+
+        Sends SIGTERM to the ffmpeg process group and escalates to
+        SIGKILL if it hasn't exited within 3 seconds.
+        """
         self.cancelled = True
-        if self.process:
+        process = self.process
+        if process is None or process.returncode is not None:
+            return
+
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+        except (ProcessLookupError, PermissionError) as e:
+            logger.error(f"Error terminating process group: {e}")
+            return
+
+        try:
+            await asyncio.wait_for(process.wait(), timeout=3.0)
+            logger.info("Merge process terminated")
+        except asyncio.TimeoutError:
             try:
-                self.process.terminate()
-                logger.info("Merge process terminated")
-            except Exception as e:
-                logger.error(f"Error terminating process: {e}")
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            logger.warning("Merge process killed after SIGTERM timeout")
 
     @staticmethod
     def check_file_exists(path: Path) -> bool:
@@ -166,7 +166,11 @@ async function checkTranscribeTaskStatus() {
         const log = document.getElementById('transcribeOutputLog');
         log.innerHTML = '';
         status.recent_output.forEach(event => {
-            appendTranscribeLogEvent(event.type, event.data);
+            if (event.type === 'transcribe_lines') {
+                event.data.lines.forEach(line => appendTranscribeLogEvent('transcribe_line', line));
+            } else {
+                appendTranscribeLogEvent(event.type, event.data);
+            }
         });
 
         // Update progress
@@ -252,6 +256,11 @@ function connectTranscribeSSE() {
             appendTranscribeLogEvent('transcribe_line', data);
         });
 
+        transcribeEventSource.addEventListener('transcribe_lines', (e) => {
+            const data = JSON.parse(e.data);
+            data.lines.forEach(line => appendTranscribeLogEvent('transcribe_line', line));
+        });
+
         transcribeEventSource.addEventListener('transcribe_complete', (e) => {
             const data = JSON.parse(e.data);
             appendTranscribeLogEvent('info', { message: `转录完成: ${data.file}` });
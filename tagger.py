@@ -1,50 +1,84 @@
 """ID3 tag embedding for MP3 files."""
 
+import os
+import re
+import shutil
 import subprocess
 import tempfile
 from pathlib import Path
 
-from mutagen.id3 import ID3, APIC, SYLT, USLT, TIT2, TPE1, TALB, Encoding
-from mutagen.mp3 import MP3
+try:
+    # Drop-in Rust port of mutagen; much faster tag parsing when installed
+    from mutagen_rs.id3 import ID3, ID3NoHeaderError, APIC, SYLT, USLT, TIT2, TPE1, TALB, Encoding
+    from mutagen_rs.mp3 import MP3
+except ImportError:
+    from mutagen.id3 import ID3, ID3NoHeaderError, APIC, SYLT, USLT, TIT2, TPE1, TALB, Encoding
+    from mutagen.mp3 import MP3
+
+
+def _ts_to_ms(minutes: int, seconds: int, frac: int, frac_digits: int) -> int:
+    """Convert a mm:ss.frac timestamp to milliseconds using integer math."""
+    ms = (minutes * 60 + seconds) * 1000
+    if frac_digits <= 3:
+        return ms + frac * 10 ** (3 - frac_digits)
+    return ms + frac // 10 ** (frac_digits - 3)
+
+
+def _copy_file(src: Path, dst: Path) -> None:
+    """Copy src to dst via os.sendfile, falling back to a userspace copy.
+
+    sendfile keeps the bytes in kernel space; preserves mtime like
+    shutil.copy2 did.
+    """
+    stat = os.stat(src)
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            offset = 0
+            while offset < stat.st_size:
+                sent = os.sendfile(fdst.fileno(), fsrc.fileno(), offset, stat.st_size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+    except (AttributeError, OSError):
+        shutil.copy2(src, dst)
+        return
+    os.utime(dst, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+
+# One or more leading [mm:ss.xx] timestamps, then the lyric text
+_LINE_RE = re.compile(r"^[ \t]*((?:\[\d+:\d+(?:\.\d+)?\])+)(.*)$", re.M)
+_TS_RE = re.compile(r"\[(\d+):(\d+)(?:\.(\d+))?\]")
 
 
 def parse_lrc(lrc_path: str) -> list[tuple[str, int]]:
     """
     Parse LRC file and return list of (text, time_ms) tuples for SYLT.
 
+    Lines carrying several timestamps (e.g. ``[00:29.02][00:44.02]text``)
+    produce one entry per timestamp; the result is sorted by time.
+
     Args:
         lrc_path: Path to the LRC file
 
     Returns:
         List of (text, milliseconds) tuples (SYLT format)
     """
-    lyrics = []
-    with open(lrc_path, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line or not line.startswith("["):
-                continue
-
-            # Parse timestamp [mm:ss.xx]
-            try:
-                bracket_end = line.index("]")
-                timestamp = line[1:bracket_end]
-                text = line[bracket_end + 1:].strip()
-
-                if not text:
-                    continue
-
-                # Parse mm:ss.xx format
-                parts = timestamp.split(":")
-                if len(parts) == 2:
-                    minutes = int(parts[0])
-                    seconds = float(parts[1])
-                    time_ms = int((minutes * 60 + seconds) * 1000)
-                    # SYLT format: (text, time_ms)
-                    lyrics.append((text, time_ms))
-            except (ValueError, IndexError):
-                continue
+    text = Path(lrc_path).read_text(encoding="utf-8")
 
+    lyrics = []
+    for match in _LINE_RE.finditer(text):
+        line_text = match.group(2).strip()
+        if not line_text:
+            continue
+
+        for minutes, seconds, frac in _TS_RE.findall(match.group(1)):
+            if frac:
+                time_ms = _ts_to_ms(int(minutes), int(seconds), int(frac), len(frac))
+            else:
+                time_ms = _ts_to_ms(int(minutes), int(seconds), 0, 1)
+            lyrics.append((line_text, time_ms))
+
+    lyrics.sort(key=lambda entry: entry[1])
     return lyrics
 
 
@@ -56,6 +90,10 @@ def embed_lyric(
     album: str = "",
     cover_path: str = "",
     title: str = "",
+    already_converted: bool = False,
+    cover_data: bytes | None = None,
+    cover_mime: str = "image/jpeg",
+    parsed_lyrics: list[tuple[str, int]] | None = None,
 ) -> bool:
     """
     Embed lyrics and metadata into MP3 file.
@@ -68,6 +106,14 @@ def embed_lyric(
         album: Album name
         cover_path: Path to cover image
         title: Song title (defaults to filename without extension)
+        already_converted: Output MP3 already exists at output_path
+            (e.g. from a parallel conversion pre-pass); skip conversion
+        cover_data: Pre-loaded cover image bytes; when given, cover_path
+            is not read from disk
+        cover_mime: MIME type for cover_data
+        parsed_lyrics: Pre-parsed (text, milliseconds) tuples (e.g. from
+            a fresh transcription); when given, the LRC file is not
+            re-parsed for SYLT
 
     Returns:
         True if successful, False otherwise
@@ -84,8 +130,14 @@ def embed_lyric(
         title = audio_path.stem
 
     # Convert to MP3 if not already
-    if audio_path.suffix.lower() != ".mp3":
-        with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as tmp_mp3:
+    if already_converted:
+        pass  # converted audio is already in place at output_path
+    elif audio_path.suffix.lower() != ".mp3":
+        # Create the temp file next to the output so the final move is a
+        # same-filesystem rename instead of a byte copy out of /tmp
+        with tempfile.NamedTemporaryFile(
+            suffix=".mp3", dir=output_path.parent, delete=False
+        ) as tmp_mp3:
             tmp_mp3_path = tmp_mp3.name
 
         try:
@@ -102,26 +154,24 @@ def embed_lyric(
                 capture_output=True,
             )
 
-            # Move to final location
-            import shutil
-            shutil.move(tmp_mp3_path, str(output_path))
+            # Atomic rename; zero-copy since temp and output share a FS
+            os.replace(tmp_mp3_path, output_path)
         except subprocess.CalledProcessError as e:
+            try:
+                os.unlink(tmp_mp3_path)
+            except OSError:
+                pass
             raise RuntimeError(f"FFmpeg conversion failed: {e.stderr.decode()}") from e
     else:
-        # Copy MP3 directly
-        import shutil
-        shutil.copy2(str(audio_path), str(output_path))
+        # Copy MP3 directly, staying in kernel space where possible
+        _copy_file(audio_path, output_path)
 
-    # Load MP3 and add ID3 tags
+    # Load the ID3 tag directly; skips mutagen's MPEG header parse and
+    # doesn't need the defensive double-open the MP3 wrapper required
     try:
-        audio = MP3(str(output_path))
-        if audio.tags is None:
-            audio.add_tags()
-    except Exception:
-        audio = MP3(str(output_path))
-        audio.add_tags()
-
-    tags = audio.tags
+        tags = ID3(str(output_path))
+    except ID3NoHeaderError:
+        tags = ID3()
 
     # Add basic metadata
     tags.add(TIT2(encoding=Encoding.UTF8, text=title))
@@ -142,7 +192,7 @@ def embed_lyric(
         tags.add(USLT(encoding=Encoding.UTF8, lang="zho", desc="", text=lrc_content))
 
     # Add synchronized lyrics (SYLT)
-    lyrics = parse_lrc(str(lyric_path))
+    lyrics = parsed_lyrics if parsed_lyrics is not None else parse_lrc(str(lyric_path))
     if lyrics:
         # Remove any existing SYLT tags first
         tags.delall("SYLT")
@@ -155,25 +205,26 @@ def embed_lyric(
         )
         tags.setall("SYLT", [sylt])
 
-    # Add cover art if provided
-    if cover_path and Path(cover_path).exists():
+    # Add cover art if provided; prefer pre-loaded bytes over disk reads
+    if cover_data is None and cover_path and Path(cover_path).exists():
         cover_path = Path(cover_path)
-        mime_type = "image/jpeg"
+        cover_mime = "image/jpeg"
         if cover_path.suffix.lower() == ".png":
-            mime_type = "image/png"
+            cover_mime = "image/png"
 
         with open(cover_path, "rb") as f:
             cover_data = f.read()
 
+    if cover_data:
         tags.add(
             APIC(
                 encoding=Encoding.UTF8,
-                mime=mime_type,
+                mime=cover_mime,
                 type=3,  # Cover (front)
                 desc="Cover",
                 data=cover_data,
             )
         )
 
-    audio.save(v2_version=4)
+    tags.save(str(output_path), v2_version=4)
     return True
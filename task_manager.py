@@ -1,12 +1,22 @@
 """Task management with SSE support and refresh recovery."""
 
 import asyncio
+import atexit
+import functools
+import json
+import os
 import subprocess
+import sys
+import tempfile
 import time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from collections import deque
 from dataclasses import dataclass
 from pathlib import Path
-from queue import Queue as ThreadQueue, Empty as QueueEmpty
 from concurrent.futures import ThreadPoolExecutor
 
 from models import (
@@ -16,12 +26,67 @@ from models import (
     TaskProgress,
     TaskStatus,
 )
-from transcriber import transcribe_audio
-from tagger import embed_lyric
+from transcriber import decode_audio, transcribe_audio
+from tagger import MP3, embed_lyric
+
+
+def _json_dumps(data) -> str:
+    """Serialize to a JSON string, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(data).decode()
+    return json.dumps(data)
+
+
+def _list_dir_names(dir_path: str) -> set[str]:
+    """Set of entry names in dir_path; empty when unset or unreadable."""
+    if not dir_path:
+        return set()
+    try:
+        with os.scandir(dir_path) as it:
+            return {entry.name for entry in it}
+    except OSError:
+        return set()
+
+
+def _lower_thread_priority():
+    """Lower the transcription worker thread's scheduling priority.
+
+    Whisper pegs a core for minutes at a time; on Linux niceness is
+    per-thread, so renicing inside the executor thread keeps the event
+    loop responsive without touching the rest of the process.
+    """
+    if sys.platform != "linux":
+        return
+    try:
+        os.nice(5)
+    except OSError:
+        pass
 
 
 def get_audio_duration(file_path: str) -> float:
-    """Get audio duration in seconds using ffprobe."""
+    """Get audio duration in seconds.
+
+    MP3 durations come straight from mutagen's header parse; other
+    formats fall back to ffprobe, cached per (path, mtime, size) so
+    re-running a batch doesn't fork a probe per file again.
+    """
+    path = Path(file_path)
+    if path.suffix.lower() == ".mp3":
+        try:
+            return MP3(file_path).info.length
+        except Exception:
+            pass  # fall through to ffprobe
+
+    try:
+        stat = path.stat()
+    except OSError:
+        return 0.0
+    return _ffprobe_duration(file_path, stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=4096)
+def _ffprobe_duration(file_path: str, mtime_ns: int, size: int) -> float:
+    """Probe duration via ffprobe; cache key includes mtime/size."""
     try:
         result = subprocess.run(
             [
@@ -49,7 +114,7 @@ def format_duration(seconds: float) -> str:
     return f"{minutes:02d}:{secs:02d}"
 
 
-@dataclass
+@dataclass(slots=True)
 class FileTask:
     """Individual file task."""
     name: str
@@ -60,7 +125,7 @@ class FileTask:
     error_message: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     """Processing task containing multiple files."""
     files: list[FileTask]
@@ -91,46 +156,97 @@ class TaskManager:
 
         self.current_task: Task | None = None
         self.output_buffer: deque[dict] = deque(maxlen=2000)  # Increased for long audio
-        self._subscribers: list[asyncio.Queue] = []
+        self._subscribers: set[asyncio.Queue] = set()
         self._lock = asyncio.Lock()
         self._task_runner: asyncio.Task | None = None
-        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._pending_lines: list[dict] = []
+        self._line_flush_task: asyncio.Task | None = None
+        # Transcription stays serialized on one worker (whisper already
+        # saturates the machine); embedding gets its own pool so tag
+        # writes never share the transcription thread
+        self._transcribe_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="asr", initializer=_lower_thread_priority
+        )
+        self._embed_executor = ThreadPoolExecutor(
+            max_workers=os.cpu_count() or 2, thread_name_prefix="embed"
+        )
+        atexit.register(self._transcribe_executor.shutdown, wait=True)
+        atexit.register(self._embed_executor.shutdown, wait=True)
+
+    @classmethod
+    def reset_for_testing(cls):
+        """Drop the singleton so tests get a fresh manager.
+
+        Tears down the previous instance's background tasks, subscriber
+        queues and executors so stale state can't leak between tests.
+        """
+        inst = cls._instance
+        if inst is not None:
+            for task in (inst._task_runner, inst._line_flush_task):
+                if task is not None:
+                    task.cancel()
+            inst._subscribers.clear()
+            inst._transcribe_executor.shutdown(wait=False)
+            inst._embed_executor.shutdown(wait=False)
+        cls._instance = None
 
     async def broadcast(self, event_type: str, data: dict):
         """Broadcast event to all SSE subscribers."""
         event = {"type": event_type, "data": data, "timestamp": time.time()}
+        # Serialize the SSE frame once; all subscribers share the string
+        event["_frame"] = f"event: {event_type}\ndata: {_json_dumps(data)}\n\n"
         self.output_buffer.append(event)
 
-        # Send to all subscribers
-        dead_queues = []
-        for queue in self._subscribers:
+        # Send to all subscribers; a full queue means the client stopped
+        # reading (dropped connection), so drop it immediately rather
+        # than keep failing put_nowait on every future broadcast
+        for queue in tuple(self._subscribers):
             try:
                 queue.put_nowait(event)
             except asyncio.QueueFull:
-                dead_queues.append(queue)
-
-        # Remove dead subscribers
-        for queue in dead_queues:
-            self._subscribers.remove(queue)
+                self._subscribers.discard(queue)
+
+    async def broadcast_line(self, time_str: str, text: str):
+        """Queue a transcribed line; lines flush as one batched event.
+
+        Whisper can emit bursts of segments; batching them into a single
+        transcribe_lines event every 50 ms keeps the per-event overhead
+        (dict, JSON, queue put per subscriber) off the hot path.
+        """
+        self._pending_lines.append({"time": time_str, "text": text})
+        if self._line_flush_task is None or self._line_flush_task.done():
+            self._line_flush_task = asyncio.create_task(self._flush_lines())
+
+    async def _flush_lines(self):
+        """Flush pending transcribe lines after a short batching window."""
+        await asyncio.sleep(0.05)
+        lines, self._pending_lines = self._pending_lines, []
+        if lines:
+            await self.broadcast("transcribe_lines", {"lines": lines})
 
     def subscribe(self) -> asyncio.Queue:
         """Subscribe to SSE events."""
         queue = asyncio.Queue(maxsize=2000)  # Increased for long audio
-        self._subscribers.append(queue)
+        self._subscribers.add(queue)
         return queue
 
     def unsubscribe(self, queue: asyncio.Queue):
         """Unsubscribe from SSE events."""
-        if queue in self._subscribers:
-            self._subscribers.remove(queue)
+        self._subscribers.discard(queue)
+
+    def get_status(self, since: float = 0.0) -> TaskStatus:
+        """Get current task status for refresh recovery.
 
-    def get_status(self) -> TaskStatus:
-        """Get current task status for refresh recovery."""
+        When ``since`` is given, recent_output only contains events with
+        a newer timestamp, so polling clients pay for new events instead
+        of the whole buffer on every request.
+        """
         if self.current_task is None:
-            return TaskStatus(running=False)
+            return TaskStatus.model_construct(running=False)
 
+        # model_construct skips validation; all fields are server-generated
         task = self.current_task
-        progress = TaskProgress(
+        progress = TaskProgress.model_construct(
             current=task.current_index + 1,
             total=len(task.files),
             phase=task.phase,
@@ -138,10 +254,26 @@ class TaskManager:
             duration=task.current_duration,
         )
 
-        return TaskStatus(
+        # Strip internal keys (the cached SSE frame) from recovery data.
+        # The buffer is time-ordered, so with `since` we walk backwards
+        # and stop at the first already-seen event.
+        if since > 0:
+            recent = []
+            for event in reversed(self.output_buffer):
+                if event["timestamp"] <= since:
+                    break
+                recent.append({k: v for k, v in event.items() if not k.startswith("_")})
+            recent.reverse()
+        else:
+            recent = [
+                {k: v for k, v in event.items() if not k.startswith("_")}
+                for event in self.output_buffer
+            ]
+
+        return TaskStatus.model_construct(
             running=task.phase not in [TaskPhase.COMPLETED, TaskPhase.FAILED, TaskPhase.CANCELLED],
             progress=progress,
-            recent_output=list(self.output_buffer),
+            recent_output=recent,
             start_time=task.start_time if task.start_time > 0 else None,
         )
 
@@ -171,6 +303,51 @@ class TaskManager:
         await self.broadcast("task_cancelled", {})
         return True
 
+    async def _convert_source(self, file_task: FileTask, sem: asyncio.Semaphore) -> str | None:
+        """Convert a non-MP3 source to MP3 in a temp file next to its output.
+
+        Returns the temp path on success, None on failure (the embed step
+        then falls back to its own conversion and error reporting).
+        """
+        async with sem:
+            output_path = Path(file_task.output_path)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(suffix=".part", dir=output_path.parent)
+            os.close(fd)
+            proc = None
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    "ffmpeg",
+                    "-i", file_task.source_path,
+                    "-codec:a", "libmp3lame",
+                    "-qscale:a", "2",
+                    "-f", "mp3",
+                    "-y",
+                    tmp_path,
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.DEVNULL,
+                )
+                if await proc.wait() != 0:
+                    raise RuntimeError("ffmpeg conversion failed")
+                return tmp_path
+            except asyncio.CancelledError:
+                # Task-end cleanup cancels unconsumed jobs: stop ffmpeg
+                # and remove the partial file before propagating
+                if proc is not None and proc.returncode is None:
+                    proc.kill()
+                    await proc.wait()
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+            except Exception:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                return None
+
     async def _run_task(self, config: Config):
         """Run the processing task."""
         task = self.current_task
@@ -181,6 +358,49 @@ class TaskManager:
         task.start_time = time.time()  # Record task start time
         loop = asyncio.get_running_loop()
 
+        # One directory listing each instead of a stat syscall per file
+        existing_lyrics = _list_dir_names(config.lyric_dir)
+        existing_outputs = _list_dir_names(config.output_dir)
+
+        # Read the cover art once for the whole batch instead of per file
+        cover_data = None
+        cover_mime = "image/jpeg"
+        if config.cover_path:
+            try:
+                cover_data = Path(config.cover_path).read_bytes()
+                if config.cover_path.lower().endswith(".png"):
+                    cover_mime = "image/png"
+            except OSError:
+                cover_data = None
+
+        # Convert non-MP3 sources in parallel while transcription runs;
+        # the converted audio waits in a temp file until its embed step
+        convert_sem = asyncio.Semaphore(max(1, (os.cpu_count() or 2) // 2))
+        convert_jobs: dict[str, asyncio.Task] = {}
+        for file_task in task.files:
+            if file_task.source_path.lower().endswith(".mp3"):
+                continue
+            if Path(file_task.output_path).name in existing_outputs:
+                continue
+            convert_jobs[file_task.name] = asyncio.create_task(
+                self._convert_source(file_task, convert_sem)
+            )
+
+        # Decode the next file's audio while the current one is still
+        # transcribing; decode is cheap ffmpeg/IO work that otherwise
+        # sits serially in front of each (much longer) transcription
+        decode_jobs: dict[str, asyncio.Future] = {}
+
+        def prefetch_decode(after_index: int):
+            for next_task in task.files[after_index + 1:]:
+                if Path(next_task.lyric_path).name in existing_lyrics:
+                    continue
+                if next_task.name not in decode_jobs:
+                    decode_jobs[next_task.name] = loop.run_in_executor(
+                        self._embed_executor, decode_audio, next_task.source_path
+                    )
+                break
+
         for i, file_task in enumerate(task.files):
             if task.cancelled:
                 break
@@ -203,70 +423,75 @@ class TaskManager:
 
             try:
                 # Check if LRC already exists
-                lyric_exists = Path(file_task.lyric_path).exists()
+                lyric_exists = Path(file_task.lyric_path).name in existing_lyrics
+
+                # Freshly transcribed lyrics are handed to the embed step
+                # in memory, skipping the LRC re-read and re-parse
+                parsed_lyrics = None
 
                 if not lyric_exists:
                     # Transcribe
                     task.phase = TaskPhase.TRANSCRIBING
 
-                    # Use a thread-safe queue to collect transcribe lines
-                    line_queue: ThreadQueue = ThreadQueue()
-                    transcribe_done = False
-                    transcribe_error = None
+                    # Use the prefetched decode if one completed; any
+                    # failure falls back to decoding inside transcribe
+                    samples = None
+                    decode_job = decode_jobs.pop(file_task.name, None)
+                    if decode_job is not None:
+                        try:
+                            samples = await decode_job
+                        except Exception:
+                            samples = None
+
+                    # Bridge worker-thread callbacks onto the loop; the
+                    # consumer wakes exactly when the next line arrives
+                    line_queue: asyncio.Queue = asyncio.Queue(maxsize=1024)
 
                     def on_transcribe_line(timestamp: str, text: str):
-                        line_queue.put(("line", timestamp, text))
+                        loop.call_soon_threadsafe(line_queue.put_nowait, ("line", timestamp, text))
 
                     # Run transcription in thread pool
                     def do_transcribe():
-                        nonlocal transcribe_done, transcribe_error
                         try:
-                            transcribe_audio(
+                            result = transcribe_audio(
                                 file_task.source_path,
                                 file_task.lyric_path,
                                 model=config.model,
                                 language=config.language,
                                 prompt=config.prompt,
                                 callback=on_transcribe_line,
+                                samples=samples,
                             )
-                            line_queue.put(("done", None, None))
+                            loop.call_soon_threadsafe(line_queue.put_nowait, ("done", result, None))
                         except Exception as e:
-                            line_queue.put(("error", str(e), None))
+                            loop.call_soon_threadsafe(line_queue.put_nowait, ("error", str(e), None))
 
-                    # Submit to executor
-                    loop.run_in_executor(self._executor, do_transcribe)
+                    # Submit to executor, then start decoding the next
+                    # file's audio in parallel with this transcription
+                    loop.run_in_executor(self._transcribe_executor, do_transcribe)
+                    prefetch_decode(i)
 
                     # Process queue until done signal
-                    finished = False
-                    while not finished:
-                        # Process all available items
-                        while True:
-                            try:
-                                item = line_queue.get_nowait()
-                            except QueueEmpty:
-                                # No more items, wait a bit
-                                await asyncio.sleep(0.1)
-                                break
-
-                            msg_type, arg1, arg2 = item
-
-                            if msg_type == "line":
-                                await self.broadcast("transcribe_line", {
-                                    "time": arg1,
-                                    "text": arg2,
-                                })
-                            elif msg_type == "done":
-                                finished = True
-                                break
-                            elif msg_type == "error":
-                                raise RuntimeError(arg1)
+                    while True:
+                        msg_type, arg1, arg2 = await line_queue.get()
+
+                        if msg_type == "line":
+                            await self.broadcast_line(arg1, arg2)
+                        elif msg_type == "done":
+                            parsed_lyrics = arg1
+                            # Flush batched lines before completion
+                            if self._line_flush_task is not None and not self._line_flush_task.done():
+                                await self._line_flush_task
+                            break
+                        elif msg_type == "error":
+                            raise RuntimeError(arg1)
 
                     await self.broadcast("transcribe_complete", {
                         "file": file_task.name,
                     })
 
                 # Check if output already exists
-                output_exists = Path(file_task.output_path).exists()
+                output_exists = Path(file_task.output_path).name in existing_outputs
 
                 if not output_exists:
                     # Embed lyrics
@@ -280,6 +505,16 @@ class TaskManager:
                         "duration": duration_str,
                     })
 
+                    # Use the pre-converted audio if the parallel pass
+                    # produced it; otherwise embed converts on its own
+                    already_converted = False
+                    convert_job = convert_jobs.pop(file_task.name, None)
+                    if convert_job is not None:
+                        tmp_path = await convert_job
+                        if tmp_path is not None:
+                            os.replace(tmp_path, file_task.output_path)
+                            already_converted = True
+
                     # Capture variables for closure
                     src = file_task.source_path
                     lrc = file_task.lyric_path
@@ -287,11 +522,17 @@ class TaskManager:
                     singer = config.singer_name
                     album = config.album_name
                     cover = config.cover_path
+                    converted = already_converted
+                    lyrics = parsed_lyrics
 
                     def do_embed():
-                        return embed_lyric(src, lrc, out, singer, album, cover)
+                        return embed_lyric(src, lrc, out, singer, album, cover,
+                                           already_converted=converted,
+                                           cover_data=cover_data,
+                                           cover_mime=cover_mime,
+                                           parsed_lyrics=lyrics)
 
-                    await loop.run_in_executor(None, do_embed)
+                    await loop.run_in_executor(self._embed_executor, do_embed)
 
                 file_task.status = FileStatus.COMPLETED
                 task.success_count += 1
@@ -318,6 +559,30 @@ class TaskManager:
                     "message": str(e),
                 })
 
+        # Drop decodes that were never consumed (skipped or cancelled)
+        for job in decode_jobs.values():
+            job.cancel()
+        for job in decode_jobs.values():
+            try:
+                await job
+            except (asyncio.CancelledError, Exception):
+                pass
+
+        # Discard conversions that were never consumed (skipped or
+        # cancelled files) so no temp files are left behind
+        for job in convert_jobs.values():
+            job.cancel()
+        for job in convert_jobs.values():
+            try:
+                tmp_path = await job
+            except (asyncio.CancelledError, Exception):
+                continue
+            if tmp_path:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+
         # Task complete
         if task.cancelled:
             task.phase = TaskPhase.CANCELLED
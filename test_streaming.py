@@ -32,7 +32,7 @@ def test_transcriber_callback():
             "-ar", "16000",
             "-ac", "1",
             str(test_audio)
-        ], capture_output=True, check=True)
+        ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
 
         print(f"Created test audio: {test_audio}")
 
@@ -81,11 +81,8 @@ async def test_task_manager_streaming():
     from models import Config
 
     # Create a fresh task manager instance for testing
-    TaskManager._instance = None
-    TaskManager._instance = None  # Reset singleton
+    TaskManager.reset_for_testing()
     manager = TaskManager()
-    manager._initialized = False
-    manager.__init__()
 
     with tempfile.TemporaryDirectory() as tmpdir:
         source_dir = Path(tmpdir) / "source"
@@ -104,7 +101,7 @@ async def test_task_manager_streaming():
             "-ar", "16000",
             "-ac", "1",
             str(test_audio)
-        ], capture_output=True, check=True)
+        ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
 
         config = Config(
             source_dir=str(source_dir),
@@ -129,16 +126,18 @@ async def test_task_manager_streaming():
         events_received = []
 
         async def collect_events():
-            while True:
-                try:
-                    event = await asyncio.wait_for(queue.get(), timeout=60.0)
-                    events_received.append(event)
-                    print(f"  [EVENT] {event['type']}: {event['data']}")
-                    if event['type'] in ['task_complete', 'task_cancelled']:
-                        break
-                except asyncio.TimeoutError:
-                    print("  [TIMEOUT] No events received for 60s")
-                    break
+            # One timeout scope around the whole loop; wait_for would
+            # allocate a wrapper task per queue.get
+            try:
+                async with asyncio.timeout(60.0):
+                    while True:
+                        event = await queue.get()
+                        events_received.append(event)
+                        print(f"  [EVENT] {event['type']}: {event['data']}")
+                        if event['type'] in ['task_complete', 'task_cancelled']:
+                            break
+            except asyncio.TimeoutError:
+                print("  [TIMEOUT] No events received for 60s")
 
         # Start task and collect events
         print("Starting task...")
@@ -152,9 +151,10 @@ async def test_task_manager_streaming():
         event_types = [e['type'] for e in events_received]
         print(f"Event types: {set(event_types)}")
 
-        # Count transcribe_line events
-        line_events = [e for e in events_received if e['type'] == 'transcribe_line']
-        print(f"Transcribe line events: {len(line_events)}")
+        # Count batched transcribe_lines events and the lines they carry
+        batch_events = [e for e in events_received if e['type'] == 'transcribe_lines']
+        total_lines = sum(len(e['data']['lines']) for e in batch_events)
+        print(f"Transcribe line batches: {len(batch_events)} ({total_lines} lines)")
 
         # Verify task completed
         if 'task_complete' in event_types:
@@ -190,26 +190,32 @@ async def test_many_events():
     from task_manager import TaskManager
 
     # Create fresh instance
-    TaskManager._instance = None
+    TaskManager.reset_for_testing()
     manager = TaskManager()
 
     # Subscribe
     queue = manager.subscribe()
 
-    # Broadcast many events
+    # Broadcast many events; payloads are prebuilt so the loop measures
+    # broadcast/queue throughput, not f-string formatting
     num_events = 500
+    payloads = [
+        {"time": f"[{i // 60:02d}:{i % 60:02d}.00]", "text": f"Test line {i}"}
+        for i in range(num_events)
+    ]
     print(f"Broadcasting {num_events} events...")
 
-    for i in range(num_events):
-        await manager.broadcast("transcribe_line", {
-            "time": f"[{i // 60:02d}:{i % 60:02d}.00]",
-            "text": f"Test line {i}",
-        })
+    for payload in payloads:
+        await manager.broadcast("transcribe_line", payload)
 
-    # Collect all events
+    # Collect all events; get_nowait drains without an await (and its
+    # loop wakeup) per item
     received = 0
-    while not queue.empty():
-        await queue.get()
+    while True:
+        try:
+            queue.get_nowait()
+        except asyncio.QueueEmpty:
+            break
         received += 1
 
     print(f"Events sent: {num_events}")
@@ -243,7 +249,7 @@ def test_buffer_limits():
     from task_manager import TaskManager
 
     # Create fresh instance
-    TaskManager._instance = None
+    TaskManager.reset_for_testing()
     manager = TaskManager()
 
     print(f"Output buffer maxlen: {manager.output_buffer.maxlen}")
@@ -263,7 +269,7 @@ if __name__ == "__main__":
 
     # Check ffmpeg
     try:
-        subprocess.run(["ffmpeg", "-version"], capture_output=True, check=True)
+        subprocess.run(["ffmpeg", "-version"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
         print("ffmpeg: OK")
     except Exception as e:
         print(f"ffmpeg: NOT FOUND - {e}")
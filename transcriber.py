@@ -1,19 +1,122 @@
 """Audio transcription using pywhispercpp."""
 
+import functools
+import logging
 import os
 import subprocess
-import tempfile
+import threading
+import wave
 from pathlib import Path
 from typing import Callable
 
+import numpy as np
 from pywhispercpp.model import Model
 
+logger = logging.getLogger(__name__)
+
+# Match whisper.cpp's thread count to the machine instead of a fixed 8,
+# which under-uses big boxes and thrashes small ones
+_N_THREADS = max(1, os.cpu_count() or 4)
+
+# Decode-speed parameters only newer whisper.cpp builds understand:
+# flash attention fuses the softmax*V memory traffic, and a greedy
+# single-candidate decode skips the sampling overhead. Filtered against
+# the binding's schema so older pywhispercpp versions just skip them.
+_SPEED_PARAMS = {
+    "flash_attn": True,
+    "temperature": 0.0,
+    "suppress_blank": True,
+    "greedy": {"best_of": 1},
+}
+try:
+    from pywhispercpp.constants import PARAMS_SCHEMA as _PARAMS_SCHEMA
+
+    _SPEED_PARAMS = {k: v for k, v in _SPEED_PARAMS.items() if k in _PARAMS_SCHEMA}
+except ImportError:
+    _SPEED_PARAMS = {}
+
+_model_load_lock = threading.Lock()
+
+# Directories already mkdir'd this run; batches share one parent, so
+# this skips a stat walk per file
+_ensured_dirs: set[Path] = set()
+
+
+@functools.lru_cache(maxsize=2)
+def _get_model(name: str) -> Model:
+    """Load a whisper model, reused across transcribe_audio calls.
+
+    Model construction reloads the GGML weights from disk (hundreds of
+    MB for the large models), which would otherwise dominate batch runs.
+    """
+    whisper = Model(name, print_realtime=False, print_progress=False)
+    try:
+        # The compute backend is fixed when pywhispercpp is built
+        # (WHISPER_COREML=1 / GGML_CUDA=1 / GGML_METAL=1 vs plain CPU)
+        # and makes a 3-5x difference for the large models — log it so
+        # an accidental pure-CPU build is obvious from the server log
+        logger.info("whisper.cpp backend: %s", Model.system_info())
+    except Exception:
+        pass
+    return whisper
+
+
+def _read_wav_16k_mono(audio_path: str) -> np.ndarray | None:
+    """Read a WAV directly when it's already 16 kHz mono 16-bit PCM.
+
+    Returns None for anything else so the caller falls back to ffmpeg.
+    """
+    try:
+        with wave.open(audio_path, "rb") as wav:
+            if (wav.getframerate(), wav.getnchannels(), wav.getsampwidth()) != (16000, 1, 2):
+                return None
+            frames = wav.readframes(wav.getnframes())
+    except (wave.Error, EOFError, OSError):
+        return None
+    return np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768.0
+
+
+def decode_audio(audio_path: str) -> np.ndarray:
+    """Decode audio to 16 kHz mono float32 samples.
+
+    Sources already in whisper's native format are read directly; for
+    everything else raw PCM is piped out of ffmpeg's stdout, so no temp
+    WAV is written to disk and read back by whisper.
+    """
+    if str(audio_path).lower().endswith(".wav"):
+        samples = _read_wav_16k_mono(str(audio_path))
+        if samples is not None:
+            return samples
+
+    result = subprocess.run(
+        [
+            "ffmpeg",
+            "-i", str(audio_path),
+            "-f", "s16le",
+            "-ar", "16000",
+            "-ac", "1",
+            "-",
+        ],
+        check=True,
+        capture_output=True,
+    )
+    samples = np.frombuffer(result.stdout, dtype=np.int16)
+    return samples.astype(np.float32) / 32768.0
+
 
 def format_timestamp(seconds: float) -> str:
     """Format seconds to LRC timestamp [mm:ss.xx]."""
-    minutes = int(seconds // 60)
-    secs = seconds % 60
-    return f"[{minutes:02d}:{secs:05.2f}]"
+    return format_timestamp_cs(round(seconds * 100))
+
+
+def format_timestamp_cs(t0_cs: int) -> str:
+    """Format integer centiseconds (whisper's native t0 unit) to [mm:ss.xx].
+
+    Pure integer divmod — no float round-trip per segment.
+    """
+    minutes, rest = divmod(t0_cs, 6000)
+    secs, cs = divmod(rest, 100)
+    return f"[{minutes:02d}:{secs:02d}.{cs:02d}]"
 
 
 def transcribe_audio(
@@ -23,7 +126,8 @@ def transcribe_audio(
     language: str = "zh",
     prompt: str = "歌词 简体中文",
     callback: Callable[[str, str], None] | None = None,
-) -> bool:
+    samples: np.ndarray | None = None,
+) -> list[tuple[str, int]]:
     """
     Transcribe audio file to LRC format.
 
@@ -33,86 +137,104 @@ def transcribe_audio(
         model: Whisper model name
         language: Language code for transcription
         prompt: Initial prompt for better transcription
-        callback: Optional callback for progress updates (time, text)
+        callback: Optional callback for progress updates (time, text).
+            Invoked from the thread running this function (whisper's
+            worker); async callers must hop back onto their event loop
+            with call_soon_threadsafe, never touch loop state directly.
+        samples: Pre-decoded 16 kHz mono float32 audio (from
+            decode_audio); lets a batch driver overlap the next file's
+            decode with the current transcription
 
     Returns:
-        True if successful, False otherwise
+        The transcribed lyrics as (text, milliseconds) tuples, ready for
+        SYLT embedding without re-reading the LRC file
     """
     audio_path = Path(audio_path)
     output_lrc_path = Path(output_lrc_path)
 
-    # Ensure output directory exists
-    output_lrc_path.parent.mkdir(parents=True, exist_ok=True)
-
-    # Convert audio to WAV format for whisper
-    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp_wav:
-        tmp_wav_path = tmp_wav.name
-
-    # Collect all lines for final LRC file
-    lrc_lines = []
+    # Ensure output directory exists (once per directory per run)
+    parent = output_lrc_path.parent
+    if parent not in _ensured_dirs:
+        parent.mkdir(parents=True, exist_ok=True)
+        _ensured_dirs.add(parent)
+
+    # Lines stream to a sibling temp file as whisper emits them (constant
+    # memory), which is renamed over the real LRC only on success — the
+    # skip-if-exists logic upstream never sees a partial transcript.
+    # The parsed (text, milliseconds) form is kept for embedding.
+    tmp_lrc_path = output_lrc_path.with_suffix(output_lrc_path.suffix + ".tmp")
+    lrc_file = None
+    parsed_lyrics: list[tuple[str, int]] = []
+    last_text = ""
 
     def on_new_segment(segment):
-        """Callback for real-time segment processing."""
-        start_time = segment.t0 / 100.0  # Convert to seconds
+        """Callback for real-time segment processing.
+
+        Near-empty segments and consecutive repeats (whisper hallucinates
+        both on instrumental passages) are dropped before they reach the
+        file or fan out to SSE subscribers.
+        """
+        nonlocal last_text
         text = segment.text.strip()
 
-        if text:
-            timestamp = format_timestamp(start_time)
-            lrc_line = f"{timestamp}{text}"
-            lrc_lines.append(lrc_line)
+        if not text or len(text) < 2 or text == last_text:
+            return
+        last_text = text
 
-            # Notify progress in real-time
-            if callback:
-                callback(timestamp, text)
+        timestamp = format_timestamp_cs(segment.t0)
+        lrc_file.write(f"{timestamp}{text}\n".encode("utf-8"))
+        parsed_lyrics.append((text, segment.t0 * 10))  # centiseconds -> ms
+
+        # Notify progress in real-time
+        if callback:
+            callback(timestamp, text)
 
     try:
-        # Convert to WAV using ffmpeg
-        subprocess.run(
-            [
-                "ffmpeg",
-                "-i", str(audio_path),
-                "-ar", "16000",
-                "-ac", "1",
-                "-y",
-                tmp_wav_path,
-            ],
-            check=True,
-            capture_output=True,
-        )
+        # Decode to 16 kHz mono samples in memory (no temp WAV), unless
+        # the caller already decoded ahead of time
+        if samples is None:
+            samples = decode_audio(str(audio_path))
+
+        # Unbuffered binary writes: each line is encoded once and hits
+        # disk directly, with no TextIOWrapper layer in between
+        lrc_file = open(tmp_lrc_path, "wb", buffering=0)
 
-        # Initialize whisper model with real-time output disabled
-        whisper = Model(model, print_realtime=False, print_progress=False)
+        # Reuse the cached whisper model; the lock keeps concurrent
+        # callers from racing the (slow) first load
+        with _model_load_lock:
+            whisper = _get_model(model)
 
         # Set parameters for transcription
         params = {
             "no_context": True,
             "n_max_text_ctx": 0,
-            "n_threads": 8,
+            "n_threads": _N_THREADS,
+            **_SPEED_PARAMS,
         }
 
         # Transcribe with real-time callback
         whisper.transcribe(
-            tmp_wav_path,
+            samples,
             language=language,
             initial_prompt=prompt,
             new_segment_callback=on_new_segment,
             **params
         )
 
-        # Write LRC file
-        with open(output_lrc_path, "w", encoding="utf-8") as f:
-            f.write("\n".join(lrc_lines))
+        lrc_file.close()
+        os.replace(tmp_lrc_path, output_lrc_path)
 
-        return True
+        return parsed_lyrics
 
     except subprocess.CalledProcessError as e:
         raise RuntimeError(f"FFmpeg conversion failed: {e.stderr.decode()}") from e
     except Exception as e:
         raise RuntimeError(f"Transcription failed: {str(e)}") from e
     finally:
-        # Cleanup temp file
-        if os.path.exists(tmp_wav_path):
-            os.unlink(tmp_wav_path)
+        if lrc_file is not None and not lrc_file.closed:
+            lrc_file.close()
+        if tmp_lrc_path.exists():
+            tmp_lrc_path.unlink()
 
 
 def get_available_models() -> list[str]: